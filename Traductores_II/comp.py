@@ -1,17 +1,14 @@
+import numpy as np
 import pandas as pd
 import re
+from collections import deque
 
 class Pila:
-    """Implementa una pila utilizando nodos enlazados."""
-
-    class Nodo:
-        """Nodo individual de la pila."""
-        def __init__(self, valor, siguiente=None):
-            self.valor = valor
-            self.siguiente = siguiente
+    """Implementa una pila sobre un collections.deque."""
 
     def __init__(self):
-        self.tope = None
+        self.tope = deque()
+        self.altura_minima = 0  # Altura más baja alcanzada desde la última llamada a extraer_cambios()
 
     def push(self, valor):
         """Agrega un elemento a la cima de la pila.
@@ -19,8 +16,7 @@ class Pila:
         Parámetros:
             valor: El valor a agregar en la pila.
         """
-        nuevo_nodo = self.Nodo(valor, self.tope)
-        self.tope = nuevo_nodo
+        self.tope.append(valor)
 
     def pop(self):
         """Elimina y retorna el elemento en la cima de la pila.
@@ -31,10 +27,11 @@ class Pila:
         Excepciones:
             Exception: Si la pila está vacía.
         """
-        if self.tope is None:
+        if not self.tope:
             raise Exception("Pila vacía")
-        valor = self.tope.valor
-        self.tope = self.tope.siguiente
+        valor = self.tope.pop()
+        if len(self.tope) < self.altura_minima:
+            self.altura_minima = len(self.tope)
         return valor
 
     def peek(self):
@@ -46,9 +43,9 @@ class Pila:
         Excepciones:
             Exception: Si la pila está vacía.
         """
-        if self.tope is None:
+        if not self.tope:
             raise Exception("Pila vacía")
-        return self.tope.valor
+        return self.tope[-1]
 
     def esta_vacia(self):
         """Verifica si la pila está vacía.
@@ -56,7 +53,7 @@ class Pila:
         Retorna:
             bool: True si la pila está vacía, False en caso contrario.
         """
-        return self.tope is None
+        return not self.tope
 
     def mostrar(self):
         """Retorna una lista con los elementos de la pila desde la base hasta la cima.
@@ -67,15 +64,33 @@ class Pila:
         Utilizado por:
             obtener_pila_como_cadena()
         """
-        contenido = []
-        nodo_actual = self.tope
-        while nodo_actual is not None:
-            contenido.append(nodo_actual.valor)
-            nodo_actual = nodo_actual.siguiente
-        return contenido[::-1]  # Invertir para mostrar desde la base hasta la cima
+        return list(self.tope)
+
+    def extraer_cambios(self):
+        """Retorna los cambios de la pila desde la llamada anterior.
+
+        Los cambios se expresan como la altura hasta la que se conservó la pila y los elementos que se
+        agregaron encima; aplicarlos en orden sobre una lista reconstruye la pila en cada momento.
+
+        Retorna:
+            tuple: (altura conservada, tupla con los elementos agregados desde la base hasta la cima).
+
+        Utilizado por:
+            AnalizadorLR.analizar()
+            AnalizadorLR.manejar_error()
+        """
+        altura = self.altura_minima
+        agregados = tuple(self.tope[i] for i in range(altura, len(self.tope)))
+        self.altura_minima = len(self.tope)
+        return altura, agregados
 
 class Arbol:
-    """Representa un nodo en el árbol de derivación sintáctica."""
+    """Representa un nodo no terminal en el árbol de derivación sintáctica.
+
+    Los terminales no tienen hijos, así que se guardan en el árbol como cadenas simples.
+    """
+
+    __slots__ = ('valor', 'hijos')  # Sin __dict__ por nodo
 
     def __init__(self, valor):
         self.valor = valor
@@ -84,17 +99,315 @@ class Arbol:
     def __str__(self):
         return str(self.valor)
 
+# Codificación entera de las celdas de la tabla LR: un desplazamiento 'dN' o un GOTO a N se guardan
+# como N (el estado 0 nunca es destino), una reducción 'rN' como -N y una celda vacía como 0.
+# La aceptación puede venir como 'accept' o como 'r0' (reducir a <Inicial>, la forma que usa
+# compilador.csv); cada una tiene un valor reservado para conservar su mensaje y su texto en la salida.
+ACCION_ERROR = 0
+ACCION_ACEPTAR = np.iinfo(np.int32).max
+ACCION_REDUCIR_INICIAL = ACCION_ACEPTAR - 1
+
+def codificar_accion(valor):
+    """Convierte una celda de la tabla LR en su código entero.
+
+    Parámetros:
+        valor (str o float): Acción ('d5', 'r3', 'accept') o estado GOTO tal como lo lee pandas.
+
+    Retorna:
+        int: El código de la acción.
+
+    Excepciones:
+        ValueError: Si la celda no es una acción ni un estado GOTO válido.
+
+    Utilizado por:
+        AnalizadorLR.cargar_tabla()
+    """
+    if not isinstance(valor, str):
+        return int(valor)
+    valor = valor.strip()
+    if valor == 'accept':
+        return ACCION_ACEPTAR
+    if valor.isdigit():
+        return int(valor)
+    if valor[:1] in ('d', 'r') and valor[1:].isdigit():
+        numero = int(valor[1:])
+        if valor[0] == 'd':
+            return numero
+        return -numero if numero != 0 else ACCION_REDUCIR_INICIAL
+    raise ValueError(f"Celda no válida en la tabla LR: '{valor}'")
+
+def decodificar_accion(codigo):
+    """Convierte un código entero de acción en su forma de texto ('d5', 'r3' o 'error').
+
+    Parámetros:
+        codigo (int): Código producido por codificar_accion().
+
+    Retorna:
+        str: La acción en el formato de la tabla LR.
+
+    Utilizado por:
+        AnalizadorLR.generar_salida()
+    """
+    if codigo == ACCION_ERROR:
+        return "error"
+    if codigo == ACCION_ACEPTAR:
+        return "accept"
+    if codigo == ACCION_REDUCIR_INICIAL:
+        return "r0"
+    if codigo < 0:
+        return f"r{-codigo}"
+    return f"d{codigo}"
+
+# Analizador léxico rápido: recorre los bytes ASCII del código con una tabla de clases de carácter y
+# reproduce la misma prioridad (incluidos los \b) que AnalizadorLR.patrones_lexicos. Devuelve un
+# arreglo de identificadores de token, índices de TOKENS_RAPIDOS, o -(carácter + 1) para un error.
+TOKENS_RAPIDOS = (
+    'identificador', 'entero', 'real', 'cadena', 'opRelac', 'opIgualdad', '=', 'opNot', 'opAnd', 'opOr',
+    'tipo', 'if', 'else', 'while', 'return', '(', ')', '{', '}', 'opSuma', 'opMul', ';', ',',
+)
+ID_IDENTIFICADOR = TOKENS_RAPIDOS.index('identificador')
+ID_ENTERO = TOKENS_RAPIDOS.index('entero')
+ID_REAL = TOKENS_RAPIDOS.index('real')
+ID_CADENA = TOKENS_RAPIDOS.index('cadena')
+ID_OP_RELAC = TOKENS_RAPIDOS.index('opRelac')
+ID_OP_IGUALDAD = TOKENS_RAPIDOS.index('opIgualdad')
+ID_ASIGNACION = TOKENS_RAPIDOS.index('=')
+ID_OP_NOT = TOKENS_RAPIDOS.index('opNot')
+ID_OP_AND = TOKENS_RAPIDOS.index('opAnd')
+ID_OP_OR = TOKENS_RAPIDOS.index('opOr')
+
+CLASE_ESPACIO, CLASE_PALABRA, CLASE_DIGITO, CLASE_LETRA = 1, 2, 4, 8
+
+# Palabras reservadas y el token que producen
+PALABRAS_RESERVADAS = (('int', 'tipo'), ('float', 'tipo'), ('if', 'if'), ('else', 'else'),
+                       ('while', 'while'), ('return', 'return'))
+
+def construir_tablas_lexicas():
+    """Construye las tablas que usa escanear_tokens().
+
+    Retorna:
+        tuple: (clases, simples, reservadas, longitudes, ids_reservadas) donde
+            clases son las clases de carácter de los 128 códigos ASCII, con la misma definición que re;
+            simples asigna su token a los caracteres sin ambigüedad (-1 para el resto);
+            reservadas contiene las palabras reservadas rellenas con ceros, con su longitud y su token.
+
+    Utilizado por:
+        Inicialización del módulo
+    """
+    clases = np.zeros(128, dtype=np.uint8)
+    for codigo in range(128):
+        caracter = chr(codigo)
+        if re.match(r'\s', caracter):
+            clases[codigo] |= CLASE_ESPACIO
+        if re.match(r'\w', caracter):
+            clases[codigo] |= CLASE_PALABRA
+        if re.match(r'\d', caracter):
+            clases[codigo] |= CLASE_DIGITO
+        if re.match(r'[a-zA-Z_]', caracter):
+            clases[codigo] |= CLASE_LETRA
+
+    simples = np.full(128, -1, dtype=np.int32)
+    for caracter, token in (('(', '('), (')', ')'), ('{', '{'), ('}', '}'), (';', ';'), (',', ','),
+                            ('+', 'opSuma'), ('*', 'opMul')):
+        simples[ord(caracter)] = TOKENS_RAPIDOS.index(token)
+
+    longitud_maxima = max(len(palabra) for palabra, _ in PALABRAS_RESERVADAS)
+    reservadas = np.zeros((len(PALABRAS_RESERVADAS), longitud_maxima), dtype=np.uint8)
+    for i, (palabra, _) in enumerate(PALABRAS_RESERVADAS):
+        reservadas[i, :len(palabra)] = np.frombuffer(palabra.encode('ascii'), dtype=np.uint8)
+    longitudes = np.array([len(palabra) for palabra, _ in PALABRAS_RESERVADAS], dtype=np.int64)
+    ids_reservadas = np.array([TOKENS_RAPIDOS.index(token) for _, token in PALABRAS_RESERVADAS],
+                              dtype=np.int32)
+    return clases, simples, reservadas, longitudes, ids_reservadas
+
+(CLASES_CARACTER, TOKENS_SIMPLES, RESERVADAS, LONGITUDES_RESERVADAS,
+ IDS_RESERVADAS) = construir_tablas_lexicas()
+
+def escanear_tokens(datos, clases, simples, reservadas, longitudes, ids_reservadas):
+    """Convierte los bytes ASCII del código fuente en identificadores de token.
+
+    Está escrito para poder compilarse con numba.njit, por lo que solo usa enteros y arreglos.
+
+    Parámetros:
+        datos (numpy.ndarray): Bytes del código fuente (uint8, solo ASCII).
+        clases (numpy.ndarray): CLASES_CARACTER.
+        simples (numpy.ndarray): TOKENS_SIMPLES.
+        reservadas, longitudes, ids_reservadas (numpy.ndarray): Tablas de palabras reservadas.
+
+    Retorna:
+        numpy.ndarray: Identificadores de TOKENS_RAPIDOS, o -(carácter + 1) para un carácter inválido.
+
+    Utilizado por:
+        AnalizadorLR.analizador_lexico_rapido()
+    """
+    n = datos.shape[0]
+    salida = np.empty(n, dtype=np.int32)
+    k = 0
+    i = 0
+    while i < n:
+        c = datos[i]
+        clase = clases[c]
+        if clase & CLASE_ESPACIO:
+            i += 1
+            continue
+        # \b al inicio de una palabra o número exige que el carácter previo no sea de palabra
+        previo_palabra = i > 0 and (clases[datos[i - 1]] & CLASE_PALABRA) != 0
+        siguiente = datos[i + 1] if i + 1 < n else 0
+        token = -1
+        fin = i + 1
+        if simples[c] >= 0:
+            token = simples[c]
+        elif clase & CLASE_LETRA:
+            if not previo_palabra:
+                while fin < n and clases[datos[fin]] & CLASE_PALABRA:
+                    fin += 1
+                token = ID_IDENTIFICADOR
+                for r in range(reservadas.shape[0]):
+                    if longitudes[r] == fin - i:
+                        igual = True
+                        for j in range(longitudes[r]):
+                            if datos[i + j] != reservadas[r, j]:
+                                igual = False
+                                break
+                        if igual:
+                            token = ids_reservadas[r]
+                            break
+        elif clase & CLASE_DIGITO:
+            if not previo_palabra:
+                j = i
+                while j < n and clases[datos[j]] & CLASE_DIGITO:
+                    j += 1
+                if j + 1 < n and datos[j] == 46 and clases[datos[j + 1]] & CLASE_DIGITO:  # '.'
+                    m = j + 1
+                    while m < n and clases[datos[m]] & CLASE_DIGITO:
+                        m += 1
+                    if m == n or not clases[datos[m]] & CLASE_PALABRA:
+                        token = ID_REAL
+                        fin = m
+                if token < 0 and (j == n or not clases[datos[j]] & CLASE_PALABRA):
+                    token = ID_ENTERO
+                    fin = j
+        elif c == 34:  # '"', la cadena no puede cruzar un salto de línea
+            j = i + 1
+            while j < n and datos[j] != 34 and datos[j] != 10:
+                j += 1
+            if j < n and datos[j] == 34:
+                token = ID_CADENA
+                fin = j + 1
+        elif c == 60 or c == 62:  # '<' o '>'
+            token = ID_OP_RELAC
+            if siguiente == 61:
+                fin = i + 2
+        elif c == 61:  # '='
+            if siguiente == 61:
+                token = ID_OP_IGUALDAD
+                fin = i + 2
+            else:
+                token = ID_ASIGNACION
+        elif c == 33:  # '!'
+            if siguiente == 61:
+                token = ID_OP_IGUALDAD
+                fin = i + 2
+            else:
+                token = ID_OP_NOT
+        elif c == 38 and siguiente == 38:  # '&&'
+            token = ID_OP_AND
+            fin = i + 2
+        elif c == 124 and siguiente == 124:  # '||'
+            token = ID_OP_OR
+            fin = i + 2
+
+        if token < 0:
+            token = -(np.int32(c) + 1)
+            fin = i + 1
+        salida[k] = token
+        k += 1
+        i = fin
+    return salida[:k]
+
+# Tamaño mínimo (en caracteres) para usar escanear_tokens compilado. Importar numba y cargar la
+# compilación guardada cuesta unas décimas de segundo, lo mismo que la expresión regular tarda en
+# unos 500 KB; la primera compilación cuesta cerca de un segundo más.
+UMBRAL_LEXICO_RAPIDO = 500_000
+
+_escanear_tokens_compilado = None
+
+def obtener_escaner_compilado():
+    """Importa numba y compila escanear_tokens() la primera vez que se necesita.
+
+    La compilación se guarda en disco (cache=True), así que las siguientes ejecuciones no la repiten.
+
+    Retorna:
+        function o None: escanear_tokens() compilada, o None si numba no está instalado.
+
+    Utilizado por:
+        AnalizadorLR.analizador_lexico_rapido()
+    """
+    global _escanear_tokens_compilado
+    if _escanear_tokens_compilado is None:
+        try:
+            from numba import njit  # Dependencia opcional
+        except ImportError:
+            return None
+        _escanear_tokens_compilado = njit(cache=True)(escanear_tokens)
+    return _escanear_tokens_compilado
+
 class AnalizadorLR:
     """Analizador sintáctico LR para realizar el análisis sintáctico de un lenguaje."""
 
-    def __init__(self, archivo_tokens, archivo_tabla):
+    # Patrones léxicos en orden de prioridad: las palabras reservadas van antes que 'identificador'
+    # y 'real' antes que 'entero' para que ganen en la alternancia.
+    # escanear_tokens() y sus tablas (TOKENS_RAPIDOS, PALABRAS_RESERVADAS) reproducen estos patrones a
+    # mano: cualquier cambio aquí debe hacerse también allá.
+    patrones_lexicos = [
+        ('(', r'\('),
+        (')', r'\)'),
+        ('{', r'\{'),
+        ('}', r'\}'),
+        ('tipo', r'\bint\b|\bfloat\b'),
+        ('if', r'\bif\b'),
+        ('else', r'\belse\b'),
+        ('while', r'\bwhile\b'),
+        ('return', r'\breturn\b'),
+        ('identificador', r'\b[a-zA-Z_][a-zA-Z0-9_]*\b'),
+        ('real', r'\b\d+\.\d+\b'),
+        ('entero', r'\b\d+\b'),
+        ('cadena', r'\".*?\"'),
+        ('opSuma', r'\+'),
+        ('opMul', r'\*'),
+        ('opRelac', r'<=|>=|<|>'),
+        ('opIgualdad', r'==|!='),
+        ('opAnd', r'&&'),
+        ('opOr', r'\|\|'),
+        ('opNot', r'!'),
+        ('=', r'='),
+        (';', r';'),
+        (',', r','),
+    ]
+
+    # Nombre de grupo válido (T0, T1, ...) -> token, ya que '(' o ';' no pueden nombrar un grupo
+    _nombres_grupos = {f'T{i}': token for i, (token, _) in enumerate(patrones_lexicos)}
+
+    # Una sola expresión con todos los patrones; 'espacio' se descarta y 'error' captura
+    # cualquier carácter no reconocido
+    _regex_lexico = re.compile(
+        '|'.join(f'(?P<T{i}>{patron})' for i, (_, patron) in enumerate(patrones_lexicos))
+        + r'|(?P<espacio>\s+)|(?P<error>.)'
+    )
+
+    def __init__(self, archivo_tokens, archivo_tabla, traza=False):
         self.simbolos = self.cargar_tokens(archivo_tokens)
-        self.tabla = self.cargar_tabla(archivo_tabla)
+        self.tabla, self.id_simbolo = self.cargar_tabla(archivo_tabla)
+        # Las consultas por paso usan listas de int de Python: indexarlas es más barato que un escalar numpy
+        self.filas_tabla = self.tabla.tolist()
         self.pila = Pila()
         self.pila.push(0)  # Estado inicial
-        self.flujo_entrada = []
+        self.estado_actual = 0
+        self.flujo_entrada = deque(['$'])  # '$' siempre está al final de la entrada
+        self.tokens_entrada = ('$',)  # Copia completa de la entrada para reconstruirla en generar_salida()
         self.errores_lexicos = []
-        self.salida_proceso = []
+        self.salida_proceso = []  # Pasos como (cambios de la pila, tokens restantes, acción)
+        self.traza = traza  # Si es True se imprime la pila en cada paso
         self.error_ocurrido = False
         self.arbol = None  # Nodo raíz del árbol de derivación
 
@@ -110,36 +423,52 @@ class AnalizadorLR:
         Llamado por:
             __init__()
         """
-        simbolos = {}
         with open(ruta_archivo, 'r') as archivo:
-            for linea in archivo:
-                if '\t' in linea:
-                    token, valor = linea.strip().split('\t')
-                    simbolos[valor] = token
-        return simbolos
+            lineas = archivo.read().splitlines()
+        # Solo las líneas 'token<TAB>valor' definen símbolos; el resto del archivo son las reglas
+        pares = (linea.strip().split('\t', 1) for linea in lineas if '\t' in linea)
+        return {valor: token for token, valor in pares}
 
     def cargar_tabla(self, ruta_archivo):
-        """Carga la tabla LR desde un archivo CSV.
+        """Carga la tabla LR desde un archivo CSV y la convierte en un arreglo de enteros.
+
+        El DataFrame solo se usa durante la carga; la tabla se guarda como un arreglo numpy int32 de
+        estados × símbolos con las acciones codificadas por codificar_accion().
+        El arreglo tiene una columna extra vacía al final, de modo que un símbolo desconocido
+        (índice -1) siempre resulta en error.
 
         Parámetros:
             ruta_archivo (str): Ruta al archivo CSV que contiene la tabla LR.
 
         Retorna:
-            pandas.DataFrame: La tabla LR.
+            tuple: (numpy.ndarray con las acciones codificadas, dict {símbolo: columna}).
+
+        Llama a:
+            codificar_accion()
 
         Llamado por:
             __init__()
         """
         tabla = pd.read_csv(ruta_archivo, index_col=0)
-        tabla.index = tabla.index.astype(int)
-        tabla.columns = tabla.columns.str.strip()
-        return tabla
+        id_simbolo = {simbolo.strip(): i for i, simbolo in enumerate(tabla.columns)}
+        estados = tabla.index.tolist()  # read_csv ya lee los estados como enteros
+        celdas = tabla.to_numpy(dtype=object)
+        del tabla  # No se conserva el DataFrame una vez extraídas las celdas
+
+        acciones = np.zeros((max(estados) + 1, len(id_simbolo) + 1), dtype=np.int32)
+        for estado, fila in zip(estados, celdas):
+            for columna, valor in enumerate(fila):
+                if pd.notna(valor):
+                    acciones[estado, columna] = codificar_accion(valor)
+        return acciones, id_simbolo
 
     def analizar(self):
         """Realiza el análisis sintáctico utilizando la tabla LR.
 
         Este método es el núcleo del analizador. En cada iteración, obtiene la acción desde la tabla LR,
         realiza la acción correspondiente (desplazar, reducir, aceptar o manejar error) y actualiza la pila.
+        Las acciones llegan codificadas como enteros (ver codificar_accion()), así que decidir qué hacer
+        solo requiere comparar el código.
 
         Llama a:
             obtener_estado_actual()
@@ -158,23 +487,26 @@ class AnalizadorLR:
                 return
 
             estado_actual = self.obtener_estado_actual()
-            token_actual = self.flujo_entrada[0] if self.flujo_entrada else '$'
-            accion = self.obtener_accion(estado_actual, token_actual)
+            token_actual = self.flujo_entrada[0]  # '$' al final garantiza que no esté vacío
+            codigo = self.obtener_accion(estado_actual, token_actual)
 
-            pila_str = self.obtener_pila_como_cadena()
-            entrada_str = ' '.join(self.flujo_entrada)
-            self.salida_proceso.append((pila_str, entrada_str, accion))
+            # Las cadenas de la pila y la entrada se construyen hasta generar_salida()
+            self.salida_proceso.append((self.pila.extraer_cambios(), len(self.flujo_entrada), codigo))
 
-            print(f"Pila actual: [ {pila_str} ]")
+            if self.traza:
+                print(f"Pila actual: [ {self.obtener_pila_como_cadena()} ]")
 
-            if accion.startswith('d'):
-                self.desplazar(accion, token_actual)
-            elif accion.startswith('r'):
-                self.reducir(accion)
-            elif accion == 'accept':
-                print("Análisis completado exitosamente.")
+            if codigo >= ACCION_REDUCIR_INICIAL:
+                if codigo == ACCION_ACEPTAR:
+                    print("Análisis completado exitosamente.")
+                else:
+                    print("Análisis terminado.")
                 self.generar_salida()
                 return
+            elif codigo > 0:
+                self.desplazar(codigo, token_actual)
+            elif codigo < 0:
+                self.reducir(-codigo)
             else:
                 self.manejar_error(estado_actual, token_actual)
                 self.generar_salida()
@@ -183,21 +515,17 @@ class AnalizadorLR:
     def obtener_estado_actual(self):
         """Obtiene el estado actual de la pila.
 
-        La pila alterna entre estados (int) y símbolos (Arbol). Este método recorre la pila desde la cima
-        hasta encontrar el primer entero, que representa el estado actual.
+        La pila alterna entre estados (int) y símbolos (Arbol o str), y tras cada desplazamiento o GOTO la cima
+        siempre es un estado. Por ello el estado actual se mantiene en self.estado_actual en lugar de
+        recorrer la pila.
 
         Retorna:
             int: El estado actual en la cima de la pila.
 
         Llamado por:
             analizar()
-            reducir()
         """
-        contenido_pila = self.pila.mostrar()
-        for elemento in reversed(contenido_pila):
-            if isinstance(elemento, int):
-                return elemento
-        raise Exception("No se encontró un estado en la pila.")
+        return self.estado_actual
 
     def obtener_accion(self, estado, token):
         """Obtiene la acción desde la tabla LR para un estado y un token dado.
@@ -210,130 +538,112 @@ class AnalizadorLR:
             token (str): El token actual en el flujo de entrada.
 
         Retorna:
-            str: La acción correspondiente desde la tabla LR.
+            int: El código de la acción correspondiente desde la tabla LR (ver codificar_accion()).
 
         Utiliza:
-            self.tabla: La tabla LR cargada previamente.
+            self.filas_tabla, self.id_simbolo: La tabla LR codificada y el índice de columna de cada símbolo.
 
         Llamado por:
             analizar()
         """
-        if token in self.tabla.columns:
-            accion = self.tabla.loc[estado, token]
-            return str(accion).strip() if pd.notna(accion) else "error"
-        else:
-            return "error"
+        return self.filas_tabla[estado][self.id_simbolo.get(token, -1)]
 
-    def desplazar(self, accion, token):
+    def desplazar(self, estado_siguiente, token):
         """Realiza una operación de desplazamiento (shift).
 
-        Agrega el token actual y el estado siguiente a la pila, y consume el token del flujo de entrada.
+        Agrega el token actual (como cadena, sin crear un Arbol) y el estado siguiente a la pila, y consume
+        el token del flujo de entrada.
 
         Parámetros:
-            accion (str): La acción obtenida de la tabla LR, por ejemplo, 'd5' para desplazar al estado 5.
+            estado_siguiente (int): El estado al que se desplaza, por ejemplo, 5 para la acción 'd5'.
             token (str): El token actual que se va a desplazar.
 
         Llama a:
             self.pila.push()
-            self.flujo_entrada.pop()
+            self.flujo_entrada.popleft()
 
         Llamado por:
             analizar()
         """
-        estado_siguiente = int(accion[1:])
-        nodo_token = Arbol(token)
-        self.pila.push(nodo_token)
+        self.pila.push(token)
         self.pila.push(estado_siguiente)
-        self.flujo_entrada.pop(0)
+        self.estado_actual = estado_siguiente
+        self.flujo_entrada.popleft()
 
-    def reducir(self, accion):
+    def reducir(self, numero_regla):
         """Realiza una operación de reducción (reduce) y construye el árbol de derivación.
 
-        Aplica la regla de reducción indicada por la acción, actualiza la pila y construye los nodos del árbol.
+        Aplica la regla de reducción indicada, actualiza la pila y construye los nodos del árbol.
+        La regla 0 (aceptación) la atiende directamente analizar().
 
         Parámetros:
-            accion (str): La acción obtenida de la tabla LR, por ejemplo, 'r3' para reducir usando la regla 3.
+            numero_regla (int): El número de la regla, por ejemplo, 3 para la acción 'r3'.
+
+        Utiliza:
+            reglas_procesadas: Reglas de producción ya separadas en cabecera y cuerpo.
 
         Llama a:
-            obtener_regla()
             self.pila.pop()
-            obtener_estado_actual()
+            self.pila.peek()
             obtener_goto()
 
         Llamado por:
             analizar()
         """
-        numero_regla = int(accion[1:])
-        if numero_regla == 0:
-            print("Análisis terminado.")
-            self.generar_salida()
-            exit()
-        if numero_regla not in reglas:
+        if numero_regla not in reglas_procesadas:
             raise KeyError(f"La regla {numero_regla} no está definida en el diccionario de reglas.")
 
-        regla = self.obtener_regla(numero_regla)
-        cabecera, cuerpo = regla.split(' ::= ')
-        tokens_cuerpo = cuerpo.strip().split()
+        cabecera, aridad, no_terminal = reglas_procesadas[numero_regla]
 
         nodo_actual = Arbol(cabecera)
 
-        if cuerpo.strip() != '\\e':
-            hijos = []
-            for _ in range(len(tokens_cuerpo)):
+        # Las reglas de uno y dos símbolos son las más frecuentes y se desapilan sin ciclo.
+        # En la pila cada símbolo (Arbol o str si es terminal) va seguido de su estado.
+        if aridad == 1:
+            self.pila.pop()
+            nodo_actual.hijos = [self.pila.pop()]
+        elif aridad == 2:
+            self.pila.pop()
+            derecho = self.pila.pop()
+            self.pila.pop()
+            nodo_actual.hijos = [self.pila.pop(), derecho]
+        elif aridad > 2:
+            # Los hijos salen de la pila de derecha a izquierda; se colocan directamente en su posición
+            hijos = [None] * aridad
+            for i in range(aridad - 1, -1, -1):
                 self.pila.pop()  # Estado
-                nodo_hijo = self.pila.pop()  # Símbolo (Arbol)
-                hijos.insert(0, nodo_hijo)
+                hijos[i] = self.pila.pop()
             nodo_actual.hijos = hijos
 
-        estado_anterior = self.obtener_estado_actual()
+        estado_anterior = self.pila.peek()  # Tras los pops la cima es un estado
         self.pila.push(nodo_actual)
-        estado_siguiente = self.obtener_goto(estado_anterior, cabecera)
-        if estado_siguiente == "error":
+        estado_siguiente = self.obtener_goto(estado_anterior, no_terminal)
+        if estado_siguiente == ACCION_ERROR:
             self.manejar_error(estado_anterior, cabecera)
             return
         self.pila.push(estado_siguiente)
+        self.estado_actual = estado_siguiente
 
-        if self.arbol is None and cabecera == '<programa>':
+        if numero_regla == REGLA_PROGRAMA and self.arbol is None:
             self.arbol = nodo_actual
 
-    def obtener_regla(self, numero_regla):
-        """Obtiene una regla de producción por su número.
-
-        Parámetros:
-            numero_regla (int): El número de la regla a obtener.
-
-        Retorna:
-            str: La regla de producción correspondiente.
-
-        Utiliza:
-            reglas: Diccionario global con las reglas de producción.
-
-        Llamado por:
-            reducir()
-        """
-        return reglas[numero_regla]
-
     def obtener_goto(self, estado, no_terminal):
         """Obtiene el estado GOTO para un no terminal dado desde un estado específico.
 
         Parámetros:
             estado (int): El estado actual en la pila.
-            no_terminal (str): El no terminal para el cual se busca el GOTO.
+            no_terminal (str): El no terminal sin '<>' para el cual se busca el GOTO.
 
         Retorna:
-            int o str: El estado siguiente si existe, o "error" si no hay transición.
+            int: El estado siguiente si existe, o ACCION_ERROR si no hay transición.
 
         Utiliza:
-            self.tabla: La tabla LR cargada previamente.
+            self.filas_tabla, self.id_simbolo: La tabla LR codificada y el índice de columna de cada símbolo.
 
         Llamado por:
             reducir()
         """
-        simbolo = no_terminal.strip('<>').strip()
-        if simbolo in self.tabla.columns:
-            goto = self.tabla.loc[estado, simbolo]
-            return int(goto) if pd.notna(goto) else "error"
-        return "error"
+        return self.filas_tabla[estado][self.id_simbolo.get(no_terminal, -1)]
 
     def manejar_error(self, estado, token):
         """Maneja los errores sintácticos y registra mensajes de error.
@@ -343,7 +653,7 @@ class AnalizadorLR:
             token (str): El token que causó el error.
 
         Llama a:
-            obtener_pila_como_cadena()
+            self.pila.extraer_cambios()
             self.salida_proceso.append()
 
         Llamado por:
@@ -352,9 +662,7 @@ class AnalizadorLR:
         """
         mensaje_error = f"Error: No hay acción para el estado {estado} y el token '{token}'"
         print(mensaje_error)
-        pila_str = self.obtener_pila_como_cadena()
-        entrada_str = ' '.join(self.flujo_entrada)
-        self.salida_proceso.append((pila_str, entrada_str, mensaje_error))
+        self.salida_proceso.append((self.pila.extraer_cambios(), len(self.flujo_entrada), mensaje_error))
         self.error_ocurrido = True
 
     def leer_codigo_fuente(self, ruta_archivo):
@@ -371,11 +679,15 @@ class AnalizadorLR:
         """
         with open(ruta_archivo, 'r') as archivo:
             codigo_fuente = archivo.read()
-        self.flujo_entrada = self.analizador_lexico(codigo_fuente) + ['$']
+        self.flujo_entrada = deque(self.analizador_lexico(codigo_fuente))
+        self.flujo_entrada.append('$')
+        self.tokens_entrada = tuple(self.flujo_entrada)
 
     def analizador_lexico(self, codigo_fuente):
         """Analiza el código fuente y genera una lista de tokens.
 
+        Recorre el código una sola vez con la expresión compilada self._regex_lexico.
+
         Parámetros:
             codigo_fuente (str): El código fuente a analizar.
 
@@ -384,70 +696,70 @@ class AnalizadorLR:
 
         Llamado por:
             leer_codigo_fuente()
+            analizador_lexico_rapido()
         """
-        patrones = {
-            '(': r'\(',
-            ')': r'\)',
-            '{': r'\{',
-            '}': r'\}',
-            'tipo': r'\bint\b|\bfloat\b',
-            'identificador': r'\b[a-zA-Z_][a-zA-Z0-9_]*\b',
-            'entero': r'\b\d+\b',
-            'real': r'\b\d+\.\d+\b',
-            'cadena': r'\".*?\"',
-            'opSuma': r'\+',
-            'opMul': r'\*',
-            'opRelac': r'<=|>=|<|>',
-            'opIgualdad': r'==|!=',
-            'opAnd': r'&&',
-            'opOr': r'\|\|',
-            'opNot': r'!',
-            '=': r'=',
-            ';': r';',
-            ',': r',',
-            'if': r'\bif\b',
-            'else': r'\belse\b',
-            'while': r'\bwhile\b',
-            'return': r'\breturn\b',
-        }
-
         tokens = []
-        posicion = 0
-        longitud_codigo = len(codigo_fuente)
-
-        while posicion < longitud_codigo:
-            match = None
-            if codigo_fuente[posicion].isspace():
-                posicion += 1
+        for match in self._regex_lexico.finditer(codigo_fuente):
+            grupo = match.lastgroup
+            if grupo == 'espacio':
                 continue
+            if grupo == 'error':
+                tokens.append(f"ERROR({match.group()})")
+            else:
+                tokens.append(self._nombres_grupos[grupo])
 
-            for token_tipo, patron in patrones.items():
-                regex = re.compile(patron)
-                match = regex.match(codigo_fuente, posicion)
-                if match:
-                    tokens.append(token_tipo)
-                    posicion = match.end()
-                    break
+        return tokens
 
-            if not match:
-                tokens.append(f"ERROR({codigo_fuente[posicion]})")
-                posicion += 1
+    def analizador_lexico_rapido(self, codigo_fuente):
+        """Analiza el código fuente con la versión compilada por numba de escanear_tokens().
 
-        return tokens
+        Produce los mismos tokens que analizador_lexico(). Es una función independiente para obtener los
+        tokens de fuentes grandes: leer_codigo_fuente() no la usa, ya que la salida del análisis
+        sintáctico crece de forma cuadrática y no es práctica con entradas de ese tamaño. Para entradas
+        menores que UMBRAL_LEXICO_RAPIDO, código no ASCII o si numba no está instalado, se usa
+        analizador_lexico() directamente.
+
+        Parámetros:
+            codigo_fuente (str): El código fuente a analizar.
+
+        Retorna:
+            list: Lista de tokens reconocidos en el código fuente.
 
-    def obtener_pila_como_cadena(self):
+        Llama a:
+            obtener_escaner_compilado()
+            analizador_lexico()
+
+        Llamado por:
+            Código que solo necesita los tokens de una entrada grande
+        """
+        if len(codigo_fuente) < UMBRAL_LEXICO_RAPIDO or not codigo_fuente.isascii():
+            return self.analizador_lexico(codigo_fuente)
+        escanear = obtener_escaner_compilado()
+        if escanear is None:
+            return self.analizador_lexico(codigo_fuente)
+        datos = np.frombuffer(codigo_fuente.encode('ascii'), dtype=np.uint8)
+        ids = escanear(datos, CLASES_CARACTER, TOKENS_SIMPLES, RESERVADAS, LONGITUDES_RESERVADAS,
+                       IDS_RESERVADAS)
+        return [TOKENS_RAPIDOS[i] if i >= 0 else f"ERROR({chr(-i - 1)})" for i in ids.tolist()]
+
+    def obtener_pila_como_cadena(self, contenido=None):
         """Convierte el contenido de la pila en una cadena para la salida.
 
+        Parámetros:
+            contenido (iterable): Elementos de la pila desde la base hasta la cima. Si es None se usa
+                la pila actual.
+
         Retorna:
             str: Representación en cadena de los elementos de la pila.
 
         Utilizado por:
             analizar()
-            manejar_error()
             generar_salida()
         """
+        if contenido is None:
+            contenido = self.pila.mostrar()
         elementos_pila = []
-        for elemento in self.pila.mostrar():
+        for elemento in contenido:
             if isinstance(elemento, int):
                 elementos_pila.append(str(elemento))
             elif isinstance(elemento, Arbol):
@@ -462,18 +774,14 @@ class AnalizadorLR:
         Crea los archivos 'salida.txt' con los detalles del análisis y 'arbol_derivacion.txt' con el árbol.
 
         Llama a:
+            generar_lineas_salida()
             generar_salida_arbol()
 
         Llamado por:
             analizar()
-            reducir()
-            manejar_error()
         """
         with open('salida.txt', 'w') as archivo_salida:
-            archivo_salida.write(f"{'Pila'.ljust(100)}{'Entrada'.ljust(40)}{'Salida'}\n")
-            for paso in self.salida_proceso:
-                pila, entrada, accion = paso
-                archivo_salida.write(f"{pila.ljust(100)}{entrada.ljust(40)}{accion}\n")
+            archivo_salida.writelines(self.generar_lineas_salida())
 
         if self.arbol:
             with open('arbol_derivacion.txt', 'w') as archivo_arbol:
@@ -481,24 +789,59 @@ class AnalizadorLR:
 
         print("El análisis ha finalizado. Revisa el archivo 'salida.txt' y 'arbol_derivacion.txt' para ver los detalles.")
 
-    def generar_salida_arbol(self, nodo, nivel=0):
+    def generar_lineas_salida(self):
+        """Genera una a una las líneas de 'salida.txt' a partir de self.salida_proceso.
+
+        Cada paso solo guarda los cambios de la pila, así que la pila se reconstruye aquí aplicándolos
+        en orden. Las líneas se producen bajo demanda para no tener todo el archivo en memoria.
+
+        Retorna:
+            generator: Las líneas del archivo, empezando por el encabezado.
+
+        Llama a:
+            obtener_pila_como_cadena()
+            decodificar_accion()
+
+        Llamado por:
+            generar_salida()
+        """
+        yield f"{'Pila':<100}{'Entrada':<40}Salida\n"
+        total_tokens = len(self.tokens_entrada)
+        pila = []
+        for (altura, agregados), restantes, accion in self.salida_proceso:
+            del pila[altura:]
+            pila.extend(agregados)
+            # Los pasos guardan el código entero; los errores guardan su mensaje
+            if not isinstance(accion, str):
+                accion = decodificar_accion(accion)
+            yield (f"{self.obtener_pila_como_cadena(pila):<100}"
+                   f"{' '.join(self.tokens_entrada[total_tokens - restantes:]):<40}{accion}\n")
+
+    def generar_salida_arbol(self, raiz):
         """Genera una representación del árbol de derivación en formato de texto.
 
+        Recorre el árbol en preorden con una pila explícita, por lo que árboles muy profundos no
+        alcanzan el límite de recursión de Python.
+
         Parámetros:
-            nodo (Arbol): El nodo actual del árbol.
-            nivel (int): El nivel de profundidad en el árbol (para indentación).
+            raiz (Arbol): El nodo raíz del árbol. Los terminales del árbol son cadenas.
 
         Retorna:
             str: Representación en cadena del árbol de derivación.
 
         Llamado por:
             generar_salida()
-            (recursivamente)
         """
-        salida = '  ' * nivel + str(nodo.valor) + '\n'
-        for hijo in nodo.hijos:
-            salida += self.generar_salida_arbol(hijo, nivel + 1)
-        return salida
+        partes = []
+        pendientes = [(raiz, 0)]
+        while pendientes:
+            nodo, nivel = pendientes.pop()
+            partes.append(f"{'  ' * nivel}{nodo}\n")
+            if isinstance(nodo, Arbol):
+                # Se apilan en orden inverso para visitar los hijos de izquierda a derecha
+                for hijo in reversed(nodo.hijos):
+                    pendientes.append((hijo, nivel + 1))
+        return ''.join(partes)
 
 # Definimos las reglas de la gramática
 reglas = {
@@ -557,6 +900,32 @@ reglas = {
     52: '<Expresion> ::= <Termino>',
 }
 
+def procesar_reglas(reglas):
+    """Separa cada regla de producción en sus partes para no repetir el trabajo en cada reducción.
+
+    Parámetros:
+        reglas (dict): Diccionario con las reglas de producción en formato de texto.
+
+    Retorna:
+        dict: Número de regla -> (cabecera, número de símbolos del cuerpo, no terminal sin '<>').
+            Las reglas épsilon ('\\e') tienen 0 símbolos.
+
+    Utilizado por:
+        reducir() a través de reglas_procesadas
+    """
+    procesadas = {}
+    for numero, regla in reglas.items():
+        cabecera, cuerpo = regla.split(' ::= ')
+        cuerpo = cuerpo.strip()
+        aridad = 0 if cuerpo == '\\e' else len(cuerpo.split())
+        procesadas[numero] = (cabecera, aridad, cabecera.strip('<>').strip())
+    return procesadas
+
+reglas_procesadas = procesar_reglas(reglas)
+
+# Única regla cuya cabecera es <programa>; al reducirla se obtiene la raíz del árbol
+REGLA_PROGRAMA = 1
+
 # Código principal
 if __name__ == "__main__":
     # Instanciar el analizador